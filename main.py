@@ -9,8 +9,11 @@ Work-Rest Manager – tray-based, dark theme, lightweight
 ▪ 休息/开始窗口仍保持 always-on-top
 """
 
-import sys, json, threading, time, platform
-from datetime import date
+import sys, os, json, threading, time, platform, signal, traceback, tracemalloc, base64, heapq, itertools, struct
+from array import array
+from collections import deque
+import queue
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk
@@ -45,14 +48,28 @@ if getattr(sys, "frozen", False):  # 打包态
 else:  # 源码态
     DATA_DIR = Path(__file__).resolve().parent
 DATA_FILE = DATA_DIR / "tiny_pomodoro_stats.json"  # 保存统计
+CONFIG_FILE = DATA_DIR / "tiny_pomodoro_config.json"  # 配置单独存放，可被外部脚本修改并热更新
 DEF_WORK_S = 50 * 60
 DEF_REST_S = 10 * 60
+MIN_SEGMENT_S = 60
+DEF_CONFIG = {"work_sec": DEF_WORK_S, "rest_sec": DEF_REST_S, "lang": "zh", "auto_start": False, "tag": ""}
 
 DARK_BG, DARK_FG = "#222831", "#eeeeee"
 ACCENT = "#00adb5"
 MARGIN = 32
 SHIFT_X, SHIFT_Y = 0, 60  # 向屏幕内偏移
 AUTO_SAVE_MS = 5 * 60 * 1000  # 5 分钟 (ms)
+TIMING_SAMPLES = 50  # 保留最近多少条耗时采样
+DEBUG_ENV = "TINY_POMODORO_DEBUG"  # =1 时开启 tracemalloc 并显示托盘「诊断转储」
+TRACE_FRAMES = 10  # tracemalloc 每个分配点保留的栈深
+DUMP_TOP_N = 25  # 转储中列出的分配点数量
+DUMP_TK_TIMEOUT_S = 2  # 等待 Tk 线程回报待执行 after 的最长时间
+POMODORO_TIMER = "pomodoro"  # 主计时在调度器中的名字
+COUNTDOWN_TAG = "meeting"  # 托盘倒计时记账用的标签
+COUNTDOWN_PREFIX = "countdown-"  # 倒计时名 = 前缀 + 自增序号，可同时存在多个
+COUNTDOWN_PRESETS_MIN = (15, 30, 60)
+RECENT_SESSIONS = 8  # 统计面板显示的最近段数
+DASHBOARD_REFRESH_MS = 1000
 
 # ---------- 语言/Localization ----------
 STRINGS = {
@@ -97,6 +114,19 @@ STRINGS = {
         "status_paused_label": "暂停中",
         "status_running_label": "计时中",
         "timer_not_started": "未开始计时",
+        "diag_dump": "诊断转储",
+        "dashboard": "统计面板",
+        "stats_week": "本周",
+        "recent_sessions": "最近记录",
+        "no_sessions": "暂无",
+        "tag_label": "标签 (项目):",
+        "countdown": "倒计时",
+        "countdown_min": "{minutes} 分钟",
+        "countdown_cancel": "取消全部倒计时",
+        "notif_countdown_title": "倒计时结束",
+        "notif_countdown_msg": "{tag} {duration}",
+        "status_side_timer": "{tag} 剩余 {remaining}",
+        "notif_dump_title": "诊断转储已写入",
         # stats strings (left Chinese to avoid large refactor)
     },
     "en": {
@@ -136,6 +166,19 @@ STRINGS = {
         "status_paused_label": "paused",
         "status_running_label": "running",
         "timer_not_started": "Timer not started",
+        "diag_dump": "Diagnostic dump",
+        "dashboard": "Dashboard",
+        "stats_week": "This week",
+        "recent_sessions": "Recent sessions",
+        "no_sessions": "None yet",
+        "tag_label": "Tag (project):",
+        "countdown": "Countdown",
+        "countdown_min": "{minutes} min",
+        "countdown_cancel": "Cancel all countdowns",
+        "notif_countdown_title": "Countdown finished",
+        "notif_countdown_msg": "{tag} {duration}",
+        "status_side_timer": "{tag} {remaining} left",
+        "notif_dump_title": "Diagnostic dump written",
     },
 }
 
@@ -147,6 +190,58 @@ def fmt_sec(sec: int) -> str:
 
 
 # ---------- 数据 ----------
+# days[YYYY-MM-DD] = array('I', 50)：下标 0-23 为各小时工作秒数，24-47 为休息秒数，
+# 48 / 49 为旧版迁移来的无小时信息的工作 / 休息秒数（计入当天合计，按小时统计时应排除）
+# 落盘时存为小端字节的 base64 字符串
+HOURS = 24
+LEGACY_WORK, LEGACY_REST = 2 * HOURS, 2 * HOURS + 1
+_BUCKET_SLOTS = 2 * HOURS + 2
+_BUCKET_OFFSET = {"total_work": 0, "total_rest": HOURS}
+
+
+def _new_buckets():
+    return array("I", bytes(array("I").itemsize * _BUCKET_SLOTS))
+
+
+def _encode_buckets(buckets) -> str:
+    if sys.byteorder == "big":
+        buckets = array("I", buckets)
+        buckets.byteswap()
+    return base64.b64encode(buckets.tobytes()).decode("ascii")
+
+
+def _decode_buckets(raw):
+    buckets = _new_buckets()
+    if isinstance(raw, dict):  # 旧格式 {"work": n, "rest": m}：无小时信息，单独存放
+        buckets[LEGACY_WORK] = int(raw.get("work", 0))
+        buckets[LEGACY_REST] = int(raw.get("rest", 0))
+        return buckets
+    packed = array("I")
+    packed.frombytes(base64.b64decode(raw))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    n = min(len(packed), _BUCKET_SLOTS)
+    buckets[:n] = packed[:n]
+    return buckets
+
+
+def _json_default(o):
+    if isinstance(o, array):
+        return _encode_buckets(o)
+    raise TypeError(f"{type(o).__name__} is not JSON serializable")
+
+
+def day_totals(stats, day: str) -> dict:
+    """某天的 {"work": 秒, "rest": 秒}"""
+    buckets = stats["days"].get(day)
+    if buckets is None:
+        return {"work": 0, "rest": 0}
+    return {
+        "work": sum(buckets[:HOURS]) + buckets[LEGACY_WORK],
+        "rest": sum(buckets[HOURS : 2 * HOURS]) + buckets[LEGACY_REST],
+    }
+
+
 def load_stats():
     """读取 / 初始化统计文件"""
     if DATA_FILE.exists():
@@ -160,29 +255,470 @@ def load_stats():
     data.setdefault("total_work", 0)  # 秒
     data.setdefault("total_rest", 0)
     data.setdefault("days", {})
-    data.setdefault("config", {"work_sec": DEF_WORK_S, "rest_sec": DEF_REST_S, "lang": "zh", "auto_start": False})
+    data.setdefault("tags", {})  # tag -> {"work": 秒, "rest": 秒, "timer": 秒}
+    for day, raw in list(data["days"].items()):
+        try:
+            data["days"][day] = _decode_buckets(raw)
+        except Exception as e:
+            print(f"[load_stats] 跳过无法解析的 {day}:", e)
+            del data["days"][day]
     return data
 
 
+# stats 会被调度线程 / 托盘线程 / Tk 线程修改和保存：修改与序列化都要持有此锁
+STATS_LOCK = threading.RLock()
+
+
 def save_stats(stats):
-    """将统计信息写入 json 文件"""
+    """将统计信息原子写入 json 文件（先写临时文件再替换，写一半不会毁掉旧数据）"""
+    tmp = DATA_FILE.with_suffix(".tmp")
     try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+        with STATS_LOCK:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(stats, f, ensure_ascii=False, indent=2, default=_json_default)
+            os.replace(tmp, DATA_FILE)
     except Exception as e:
         # 写盘失败时不终止程序，但给出调试信息
         print("[save_stats] 写文件失败:", e)
 
 
-def add_seconds(stats, key, seconds: int):
-    """累计秒数到 total_work / total_rest，并写入当天"""
+def add_tag_seconds(stats, tag: str, kind: str, seconds: int):
+    """按标签累计秒数（kind: work / rest / timer），不写盘"""
+    if not tag or seconds <= 0:
+        return
+    with STATS_LOCK:
+        entry = stats["tags"].setdefault(tag, {})
+        entry[kind] = entry.get(kind, 0) + seconds
+
+
+def add_seconds(stats, key, seconds: int, end: float | None = None, tag: str = ""):
+    """累计秒数到 total_work / total_rest，并按 [end - seconds, end) 拆分到各天各小时"""
     if seconds <= 0:
         return
+    with STATS_LOCK:
+        _add_seconds_locked(stats, key, seconds, end, tag)
+        save_stats(stats)
+
+
+def _add_seconds_locked(stats, key, seconds, end, tag):
     stats[key] += seconds
-    today = str(date.today())
-    day = stats["days"].setdefault(today, {"work": 0, "rest": 0})
-    day[key.split("_")[1]] += seconds
-    save_stats(stats)
+    add_tag_seconds(stats, tag, key.split("_")[1], seconds)
+    offset = _BUCKET_OFFSET[key]
+    t = int(end if end is not None else time.time())
+    remaining = seconds
+    while remaining > 0:
+        # 取 t-1 所在的小时：区间右开，整点时刻属于上一小时的末尾
+        dt = datetime.fromtimestamp(t - 1)
+        hour_start = int(dt.replace(minute=0, second=0, microsecond=0).timestamp())
+        chunk = min(remaining, max(1, t - hour_start))
+        day = stats["days"].get(str(dt.date()))
+        if day is None:
+            day = stats["days"][str(dt.date())] = _new_buckets()
+        day[offset + dt.hour] += chunk
+        t -= chunk
+        remaining -= chunk
+
+
+# ---------- 配置 ----------
+def validate_config(raw) -> dict:
+    """从外部来源的 dict 中挑出合法配置项；非法项打印后忽略"""
+    out = {}
+    if not isinstance(raw, dict):
+        print("[config] 配置不是对象，已忽略")
+        return out
+    for key in ("work_sec", "rest_sec"):
+        v = raw.get(key)
+        if isinstance(v, int) and not isinstance(v, bool) and v >= MIN_SEGMENT_S:
+            out[key] = v
+        elif key in raw:
+            print(f"[config] 忽略非法 {key}: {v!r}")
+    if raw.get("lang") in STRINGS:
+        out["lang"] = raw["lang"]
+    elif "lang" in raw:
+        print(f"[config] 忽略非法 lang: {raw['lang']!r}")
+    if isinstance(raw.get("auto_start"), bool):
+        out["auto_start"] = raw["auto_start"]
+    elif "auto_start" in raw:
+        print(f"[config] 忽略非法 auto_start: {raw['auto_start']!r}")
+    if isinstance(raw.get("tag"), str):
+        out["tag"] = raw["tag"].strip()
+    elif "tag" in raw:
+        print(f"[config] 忽略非法 tag: {raw['tag']!r}")
+    return out
+
+
+def read_config_file():
+    """读取并校验配置文件，只返回合法项；文件缺失 / 无法解析（如写到一半）时返回 None"""
+    try:
+        with open(CONFIG_FILE, encoding="utf-8") as f:
+            return validate_config(json.load(f))
+    except Exception as e:
+        print("[config] 读取失败:", e)
+        return None
+
+
+def load_config(legacy=None) -> dict:
+    """启动时读取配置（缺省项用默认值补齐）；首次运行时从统计文件里旧的 config 段迁移"""
+    config = dict(DEF_CONFIG)
+    if CONFIG_FILE.exists():
+        config.update(read_config_file() or {})
+    elif legacy is not None:
+        config.update(validate_config(legacy))
+        save_config(config)
+    return config
+
+
+def save_config(config):
+    """原子写入配置文件（先写临时文件再替换）"""
+    tmp = CONFIG_FILE.with_suffix(".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, CONFIG_FILE)
+    except Exception as e:
+        print("[config] 写文件失败:", e)
+
+
+class ConfigWatcher:
+    """监听配置文件变更并回调 on_change
+
+    Linux：inotify 监视所在目录（编辑器常用改名覆盖），后台线程阻塞读取事件，无轮询。
+    Windows：FindFirstChangeNotificationW 监视所在目录，后台线程 WaitForSingleObject 阻塞等待，
+    目录有变化时再比较配置文件 mtime，只对它本身的修改回调。
+    其它平台或监听失败：调用方在已有的时机（段开始、托盘操作、自动保存）调用 check() 比较 mtime。
+    """
+
+    _IN_CLOSE_WRITE, _IN_MOVED_TO, _IN_CREATE = 0x008, 0x080, 0x100
+    _EVENT_HDR = struct.Struct("iIII")
+    _FILE_NOTIFY_CHANGE_FILE_NAME, _FILE_NOTIFY_CHANGE_LAST_WRITE = 0x001, 0x010
+    _INFINITE, _WAIT_OBJECT_0 = 0xFFFFFFFF, 0
+
+    def __init__(self, path: Path, on_change):
+        self.path = path
+        self.on_change = on_change
+        self._fd = None
+        self._live = False  # 事件监听线程在运行时 check() 不做任何事
+        self._mtime = self._stat()
+
+    def _stat(self):
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def start(self):
+        system = platform.system()
+        if system == "Windows":
+            self._start_windows()
+        elif system == "Linux":
+            self._start_inotify()
+
+    def _start_windows(self):
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+            k32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+            k32.FindFirstChangeNotificationW.argtypes = (wintypes.LPCWSTR, wintypes.BOOL, wintypes.DWORD)
+            k32.FindNextChangeNotification.argtypes = (wintypes.HANDLE,)
+            k32.FindCloseChangeNotification.argtypes = (wintypes.HANDLE,)
+            k32.WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+            k32.WaitForSingleObject.restype = wintypes.DWORD
+            mask = self._FILE_NOTIFY_CHANGE_FILE_NAME | self._FILE_NOTIFY_CHANGE_LAST_WRITE
+            handle = k32.FindFirstChangeNotificationW(str(self.path.parent), False, mask)
+            if handle in (None, wintypes.HANDLE(-1).value):
+                raise OSError(ctypes.get_last_error(), "FindFirstChangeNotificationW")
+        except (OSError, AttributeError) as e:
+            print("[config] 目录变更通知不可用，改用 mtime 检查:", e)
+            return
+        self._live = True
+        threading.Thread(target=self._watch_windows, args=(k32, handle), name="config-watch", daemon=True).start()
+
+    def _watch_windows(self, k32, handle):
+        try:
+            while True:
+                if k32.WaitForSingleObject(handle, self._INFINITE) != self._WAIT_OBJECT_0:
+                    print("[config] 等待目录变更失败，改用 mtime 检查")
+                    return
+                # 目录里任何文件（包括统计文件）变化都会唤醒，这里只认配置文件本身
+                mtime = self._stat()
+                if mtime != self._mtime:
+                    self._mtime = mtime
+                    self._fire()
+                if not k32.FindNextChangeNotification(handle):
+                    print("[config] FindNextChangeNotification 失败，改用 mtime 检查")
+                    return
+        finally:
+            self._live = False
+            k32.FindCloseChangeNotification(handle)
+
+    def _start_inotify(self):
+        try:
+            import ctypes, ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1")
+            mask = self._IN_CLOSE_WRITE | self._IN_MOVED_TO | self._IN_CREATE
+            if libc.inotify_add_watch(fd, os.fsencode(self.path.parent), mask) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch")
+        except (OSError, AttributeError) as e:
+            print("[config] inotify 不可用，改用 mtime 检查:", e)
+            return
+        self._fd = fd
+        self._live = True
+        threading.Thread(target=self._watch, name="config-watch", daemon=True).start()
+
+    def _fire(self):
+        # 回调里的 root.after 在主循环未运行（启动 / 退出阶段）时会抛错，不能让它打断监听
+        try:
+            self.on_change()
+        except Exception as e:
+            print("[config] 变更回调失败:", e)
+
+    def _watch(self):
+        name = os.fsencode(self.path.name)
+        try:
+            while True:
+                try:
+                    buf = os.read(self._fd, 4096)
+                except OSError as e:
+                    print("[config] inotify 读取失败，改用 mtime 检查:", e)
+                    return
+                off, hit = 0, False
+                while off < len(buf):
+                    _, _, _, length = self._EVENT_HDR.unpack_from(buf, off)
+                    off += self._EVENT_HDR.size
+                    hit |= buf[off : off + length].rstrip(b"\0") == name
+                    off += length
+                if hit:
+                    self._fire()
+        finally:
+            # 监听线程退出后交还给 mtime 回退方案
+            fd, self._fd = self._fd, None
+            self._mtime = self._stat()
+            self._live = False
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def check(self):
+        """mtime 回退方案；事件监听生效时为空操作"""
+        if self._live:
+            return
+        mtime = self._stat()
+        if mtime != self._mtime:
+            self._mtime = mtime
+            self._fire()
+
+
+# ---------- 诊断转储 ----------
+def debug_enabled() -> bool:
+    return os.environ.get(DEBUG_ENV, "") not in ("", "0")
+
+
+def write_diagnostic_dump(app, fetch_pending_after=None) -> Path:
+    """把线程栈 / 计时状态 / 内存分配 / 耗时采样 / 待执行 after 写入文本文件
+
+    前几项在调用线程中立即采集；fetch_pending_after 最后调用，
+    可能因 Tk 无响应超时而返回 None，不影响其它内容。
+    """
+    # 先拍快照，避免把下面格式化栈的分配也算进去
+    snap = None
+    if tracemalloc.is_tracing():
+        snap = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        cur, peak = tracemalloc.get_traced_memory()
+    now = datetime.now()
+    stem = f"tiny_pomodoro_dump_{now:%Y%m%d_%H%M%S}_{now.microsecond // 1000:03d}"
+    path = DATA_DIR / f"{stem}.txt"
+    for n in itertools.count(1):  # 同一毫秒内的多次转储不互相覆盖
+        if not path.exists():
+            break
+        path = DATA_DIR / f"{stem}_{n}.txt"
+    lines = [f"Tiny Pomodoro diagnostic dump  {now.isoformat(timespec='seconds')}", ""]
+
+    lines.append("== WorkRestApp state ==")
+    for name in ("state", "elapsed_seconds", "session_flushed", "work_sec", "rest_sec", "tag", "lang", "auto_start"):
+        lines.append(f"{name} = {getattr(app, name, None)!r}")
+    lines.append(f"running = {app.running.is_set()}  paused = {app.paused.is_set()}")
+    for name, tag, left in app.scheduler.active():
+        lines.append(f"timer {name!r} tag={tag!r} remaining={left:.1f}s")
+    lines.append("")
+
+    lines.append("== Threads ==")
+    frames = sys._current_frames()
+    for th in threading.enumerate():
+        lines.append(f"--- {th.name} (ident={th.ident}, daemon={th.daemon}) ---")
+        frame = frames.get(th.ident)
+        if frame is not None:
+            lines.extend(l.rstrip("\n") for l in traceback.format_stack(frame))
+    lines.append("")
+
+    lines.append("== tracemalloc top allocations ==")
+    if snap is not None:
+        lines.append(f"current={cur / 1024:.1f} KiB  peak={peak / 1024:.1f} KiB")
+        for st in snap.statistics("traceback")[:DUMP_TOP_N]:
+            lines.append(f"{st.size / 1024:.1f} KiB in {st.count} blocks")
+            lines.extend("    " + l for l in st.traceback.format())
+    else:
+        lines.append(f"(tracing off; start with {DEBUG_ENV}=1)")
+    lines.append("")
+
+    lines.append("== Recent timing samples ==")
+    for name, seconds, ts in list(app.timings):
+        lines.append(f"{datetime.fromtimestamp(ts):%H:%M:%S}  {name}: {seconds * 1000:.1f} ms")
+    if not app.timings:
+        lines.append("(none)")
+    lines.append("")
+
+    lines.append("== Pending Tk after callbacks ==")
+    pending_after = fetch_pending_after() if fetch_pending_after else None
+    if pending_after is None:
+        lines.append(f"(not collected: Tk thread did not respond within {DUMP_TK_TIMEOUT_S}s)")
+    else:
+        lines.extend(pending_after or ["(none)"])
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+# ---------- 定时器调度 ----------
+class _Timer:
+    __slots__ = ("name", "tag", "seconds", "callback", "interval", "deadline", "remaining", "seq")
+
+    def __init__(self, name, tag, seconds, callback, interval):
+        self.name, self.tag, self.seconds = name, tag, seconds
+        self.callback, self.interval = callback, interval
+        self.deadline = 0.0
+        self.remaining = None  # 暂停时保存剩余秒数
+        self.seq = None  # 当前有效的堆条目序号；None 表示不在堆中
+
+
+class TimerScheduler:
+    """单线程 + 截止时间小顶堆，管理任意多个具名定时器
+
+    增删 / 触发均为 O(log n)；取消与暂停采用惰性删除（堆中旧条目的 seq 不再匹配即跳过）。
+    回调在调度线程中、锁外执行，应尽量简短；重复定时器错过的周期不会补触发。
+    """
+
+    def __init__(self):
+        self._heap = []  # (deadline, seq, name)
+        self._timers = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="timer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _push(self, timer):
+        timer.seq = next(self._seq)
+        heapq.heappush(self._heap, (timer.deadline, timer.seq, timer.name))
+        # 新条目成为堆顶时才需要唤醒调度线程
+        if self._heap[0][1] == timer.seq:
+            self._cond.notify()
+
+    def add(self, name, seconds, callback, tag="", interval=None):
+        """添加（或替换同名）定时器；interval 不为空时按固定节拍重复触发"""
+        with self._cond:
+            timer = _Timer(name, tag, seconds, callback, interval)
+            timer.deadline = time.monotonic() + seconds
+            self._timers[name] = timer
+            self._push(timer)
+
+    def cancel(self, name):
+        """取消并返回定时器（不存在时返回 None）"""
+        with self._cond:
+            timer = self._timers.pop(name, None)
+            if timer is not None:
+                timer.seq = None
+            return timer
+
+    def pause(self, name):
+        with self._cond:
+            timer = self._timers.get(name)
+            if timer is None or timer.seq is None:
+                return
+            timer.remaining = max(0.0, timer.deadline - time.monotonic())
+            timer.seq = None
+
+    def resume(self, name):
+        with self._cond:
+            timer = self._timers.get(name)
+            if timer is None or timer.remaining is None:
+                return
+            timer.deadline = time.monotonic() + timer.remaining
+            timer.remaining = None
+            self._push(timer)
+
+    def active(self):
+        """[(name, tag, 剩余秒数)]，按到期先后排序"""
+        now = time.monotonic()
+        with self._cond:
+            rows = [
+                (t.name, t.tag, t.remaining if t.remaining is not None else max(0.0, t.deadline - now))
+                for t in self._timers.values()
+            ]
+        return sorted(rows, key=lambda r: r[2])
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    # 丢弃已取消 / 已暂停留下的旧条目
+                    while self._heap and self._stale(self._heap[0]):
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+                    break
+                _, _, name = heapq.heappop(self._heap)
+                timer = self._timers[name]
+                if timer.interval:
+                    # 以上一次截止时间为基准，不累积漂移；
+                    # 落后超过一个周期（回调阻塞、系统睡眠后 monotonic 仍在走）则丢弃错过的触发，从现在重新计
+                    timer.deadline += timer.interval
+                    now = time.monotonic()
+                    if timer.deadline < now - timer.interval:
+                        timer.deadline = now + timer.interval
+                    self._push(timer)
+                else:
+                    del self._timers[name]
+                    timer.seq = None
+            try:
+                timer.callback(timer)
+            except Exception as e:
+                print(f"[timer] {name} 回调出错:", e)
+
+    def _stale(self, entry):
+        timer = self._timers.get(entry[2])
+        return timer is None or timer.seq != entry[1]
 
 
 # ---------- 开机自启动（仅 Windows 实现） ----------
@@ -210,13 +746,18 @@ def set_auto_start(enable: bool, app_name: str = "TinyPomodoro", exe_path: str |
 
 
 # ---------- 通用深色 ttk Style ----------
-def apply_dark_style(widget):
-    style = ttk.Style(widget)
+def apply_dark_style(root):
+    """ttk Style 属于整个 Tk 解释器，每个 root 只需配置一次"""
+    if getattr(root, "_dark_style_applied", False):
+        return
+    root._dark_style_applied = True
+    style = ttk.Style(root)
     style.theme_use("clam")
     style.configure("TLabel", background=DARK_BG, foreground=DARK_FG)
     style.configure("TEntry", fieldbackground="#393e46", foreground=DARK_FG)
     style.configure("TButton", background=ACCENT, foreground=DARK_FG)
     style.map("TButton", background=[("active", "#019ca3")])
+    style.configure("Horizontal.TProgressbar", background=ACCENT, troughcolor="#393e46", bordercolor=DARK_BG)
 
 
 # ---------- 启动弹窗 ----------
@@ -241,7 +782,6 @@ class StartWindow(tk.Toplevel):
         self.configure(bg=DARK_BG)
         self.resizable(False, False)
         self.attributes("-topmost", True)  # 置顶
-        apply_dark_style(self)
 
         ttk.Button(self, text=self.app.t("start_work_btn"), width=18, command=self._begin).grid(
             row=0, column=0, padx=25, pady=25
@@ -253,7 +793,8 @@ class StartWindow(tk.Toplevel):
     def _place_pos(self):
         self.update_idletasks()
         sw, sh = self.winfo_screenwidth(), self.winfo_screenheight()
-        w, h = self.winfo_width(), self.winfo_height()
+        # 用请求尺寸：窗口被 withdraw 复用时 winfo_width 可能仍是 1
+        w, h = self.winfo_reqwidth(), self.winfo_reqheight()
         x = sw - w - (MARGIN + SHIFT_X)
         y = sh - h - (MARGIN + SHIFT_Y)
         self.geometry(f"{w}x{h}+{x}+{y}")
@@ -291,7 +832,6 @@ class RestWindow(tk.Toplevel):
         self.configure(bg=DARK_BG)
         self.resizable(False, False)
         self.attributes("-topmost", True)  # 置顶
-        apply_dark_style(self)
 
         self.var_info = tk.StringVar()
         ttk.Label(self, textvariable=self.var_info).grid(
@@ -301,14 +841,16 @@ class RestWindow(tk.Toplevel):
             row=1, column=0, pady=(0, 20)
         )
 
-        self.after(10, self._place_pos)
-        self._tick()
+        self._tick_id = None
+        self._shown_at = None  # 休息开始时刻 (perf_counter)，窗口映射后上报耗时
+        self.bind("<Map>", self._on_map)
         self.protocol("WM_DELETE_WINDOW", self._end_rest)
 
     def _place_pos(self):
         self.update_idletasks()
         sw, sh = self.winfo_screenwidth(), self.winfo_screenheight()
-        w, h = self.winfo_width(), self.winfo_height()
+        # 用请求尺寸：窗口被 withdraw 复用时 winfo_width 可能仍是 1
+        w, h = self.winfo_reqwidth(), self.winfo_reqheight()
         x = sw - w - (MARGIN + SHIFT_X)
         y = sh - h - (MARGIN + SHIFT_Y)
         self.geometry(f"{w}x{h}+{x}+{y}")
@@ -323,10 +865,30 @@ class RestWindow(tk.Toplevel):
         # Recalculate size in case text length (especially in English) changes
         self._place_pos()
         if self.app.state in ("resting", "paused_rest"):
-            self.after(1000, self._tick)
+            self._tick_id = self.after(1000, self._tick)
+        else:
+            self._tick_id = None
+
+    def _on_map(self, event):
+        if event.widget is not self or self._shown_at is None:
+            return
+        self.app.record_timing("rest_window_visible", time.perf_counter() - self._shown_at)
+        self._shown_at = None
+
+    def show(self, began_at=None):
+        """复用窗口：刷新内容、重启计时刷新并显示"""
+        self._shown_at = began_at
+        if self._tick_id is not None:
+            self.after_cancel(self._tick_id)
+        self._tick()
+        self.deiconify()
+        self.lift()
 
     def _end_rest(self):
-        self.destroy()
+        if self._tick_id is not None:
+            self.after_cancel(self._tick_id)
+            self._tick_id = None
+        self.withdraw()
         self.app.end_rest()
 
     def refresh_info(self):
@@ -350,6 +912,44 @@ class RestWindow(tk.Toplevel):
         self.refresh_info()
 
 
+# ---------- 窗口管理 ----------
+class WindowManager:
+    """每种 Toplevel 只构建一次，之后用 deiconify / withdraw 复用"""
+
+    def __init__(self, app):
+        self.app = app
+        self._wins = {}
+        apply_dark_style(app.root)
+
+    def get(self, cls):
+        """返回 cls 的唯一实例，不存在（或已被销毁）时新建并隐藏"""
+        win = self.peek(cls)
+        if win is None:
+            win = cls(self.app)
+            win.withdraw()
+            self._wins[cls] = win
+        return win
+
+    def peek(self, cls):
+        """返回已存在的实例，不会新建"""
+        win = self._wins.get(cls)
+        if win is not None and win.winfo_exists():
+            return win
+        return None
+
+    def show(self, cls, *args):
+        win = self.get(cls)
+        if hasattr(win, "show"):
+            win.show(*args)
+        else:
+            win.deiconify()
+            win.lift()
+        return win
+
+    def existing(self):
+        return [w for w in self._wins.values() if w.winfo_exists()]
+
+
 # ---------- 主应用 ----------
 class WorkRestApp:
     # Translation helper will be instantiated later
@@ -373,16 +973,21 @@ class WorkRestApp:
         # -------------------------------------------
 
         self.stats = load_stats()
-        # --- Language setting ---
-        self.lang = self.stats["config"].get("lang", "zh")
-        self.stats["config"].setdefault("lang", self.lang)
+        # 配置独立成文件；旧版统计文件里的 config 段仅用于首次迁移
+        self.config = load_config(self.stats.pop("config", None))
+        self.lang = self.config["lang"]
 
-        self.auto_start = self.stats["config"].get("auto_start", False)
+        self.auto_start = self.config["auto_start"]
         # Ensure registry matches preference
         set_auto_start(self.auto_start)
 
-        self.work_sec = self.stats["config"]["work_sec"]
-        self.rest_sec = self.stats["config"]["rest_sec"]
+        self.work_sec = self.config["work_sec"]
+        self.rest_sec = self.config["rest_sec"]
+        self.tag = self.config["tag"]  # 当前项目标签，主计时按它分账
+
+        # 配置文件被外部修改时回到 Tk 线程重新加载
+        self.config_watcher = ConfigWatcher(CONFIG_FILE, lambda: self.root.after(0, self._reload_config))
+        self.config_watcher.start()
 
         self.state = "idle"
         self.elapsed_seconds = 0
@@ -393,15 +998,33 @@ class WorkRestApp:
 
         self.icon = None
         self.tray_thread = None
-        self.timer_thread = None
-        self.settings_win = None
-        self.rest_win = None
+        # 主计时与所有附加倒计时共用一个调度线程
+        self.scheduler = TimerScheduler()
+        self.scheduler.start()
+        self._countdown_ids = itertools.count(1)
+        # 通知可能阻塞（win11toast 会等到 toast 消失），统一交给单独线程依次发送
+        self._notify_queue = queue.Queue()
+        threading.Thread(target=self._notify_worker, name="notify", daemon=True).start()
+        self.timings = deque(maxlen=TIMING_SAMPLES)  # (名称, 秒, 时间戳)
+        self.sessions = deque(maxlen=RECENT_SESSIONS)  # 已结束的段：(work/rest, 开始时间戳, 秒, 标签)
+        self.segment_started = None
+
+        # 诊断：tracemalloc 需显式开启；POSIX 上 SIGUSR1 触发转储
+        self.debug = debug_enabled()
+        if self.debug and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        self._after_fetch = None  # (结果, 完成事件)：尚未被 Tk 线程处理的 after 查询
+        self._after_fetch_lock = threading.Lock()
+        self._install_dump_signal()
 
         # 启动自动保存循环
         self._auto_save()
 
-        # Keep reference so we can refresh its texts when language changes
-        self.start_win = StartWindow(self)
+        # 所有子窗口都由 WindowManager 构建一次、之后复用
+        self.windows = WindowManager(self)
+        self.windows.show(StartWindow)
+        # 休息窗口提前隐藏构建，休息开始时只需刷新并显示
+        self.windows.get(RestWindow)
 
     def _load_tk_icon(self):
         """返回 tk.PhotoImage，用于窗口左上角和任务栏"""
@@ -417,6 +1040,7 @@ class WorkRestApp:
     def _auto_save(self):
         """每 5 分钟持久化一次统计数据"""
         save_stats(self.stats)
+        self.config_watcher.check()
         try:
             self.root.after(AUTO_SAVE_MS, self._auto_save)
         except RuntimeError:
@@ -428,16 +1052,167 @@ class WorkRestApp:
         if self.state in ("working", "paused_work"):
             delta = self.elapsed_seconds - self.session_flushed
             if delta > 0:
-                add_seconds(self.stats, "total_work", delta)
+                add_seconds(self.stats, "total_work", delta, tag=self.tag)
                 self.session_flushed += delta
         elif self.state in ("resting", "paused_rest"):
             delta = self.elapsed_seconds - self.session_flushed
             if delta > 0:
-                add_seconds(self.stats, "total_rest", delta)
+                add_seconds(self.stats, "total_rest", delta, tag=self.tag)
                 self.session_flushed += delta
 
+    # === 配置 ===
+    def apply_config(self, changes, persist=True):
+        """应用已校验的配置变更（设置窗口 / 配置文件热更新共用，需在 Tk 线程调用）"""
+        changes = {k: v for k, v in changes.items() if self.config.get(k) != v}
+        if not changes:
+            return
+        if "tag" in changes:
+            self._flush_elapsed()  # 已过时间记到旧标签名下
+        self.config.update(changes)
+        self.work_sec = self.config["work_sec"]
+        self.rest_sec = self.config["rest_sec"]
+        self.tag = self.config["tag"]
+        if "auto_start" in changes:
+            self.auto_start = self.config["auto_start"]
+            set_auto_start(self.auto_start)
+        if persist:
+            save_config(self.config)
+
+        # ✨ 如果正在休息，就立即刷新窗口显示
+        rest_win = self.windows.peek(RestWindow)
+        if "rest_sec" in changes and rest_win is not None:
+            rest_win.refresh_info()
+        if (
+            self.state in ("working", "paused_work")
+            and self.elapsed_seconds >= self.work_sec
+        ):
+            # 让工作段立即结束
+            self.paused.clear()
+            self.scheduler.resume(POMODORO_TIMER)
+        if "lang" in changes:
+            self.lang = self.config["lang"]
+            self.apply_language_change()
+        # 设置窗口打开时同步输入框，避免「保存并关闭」把外部修改覆盖回旧值
+        settings_win = self.windows.peek(SettingsWindow)
+        if settings_win is not None:
+            settings_win.sync_fields(changes)
+
+    def _reload_config(self):
+        """热更新：只把文件中合法的项合并到当前配置；读不出来时保持原样"""
+        changes = read_config_file()
+        if changes is None:
+            return
+        self.apply_config(changes, persist=False)
+
+    # === 耗时采样 ===
+    def record_timing(self, name, seconds):
+        """记录一条耗时采样并打印，便于排查界面卡顿"""
+        self.timings.append((name, seconds, time.time()))
+        print(f"[timing] {name}: {seconds * 1000:.1f} ms")
+
+    # === 诊断转储 ===
+    def _pending_after(self):
+        """列出 Tk 尚未执行的 after 回调（必须在 Tk 线程调用）"""
+        out = []
+        try:
+            for aid in self.root.tk.splitlist(self.root.tk.call("after", "info")):
+                script, kind = self.root.tk.splitlist(self.root.tk.call("after", "info", aid))
+                out.append(f"{aid} [{kind}] {script}")
+        except tk.TclError as e:
+            out.append(f"(after info failed: {e})")
+        return out
+
+    def _pending_after_with_timeout(self):
+        """尽力从 Tk 线程取待执行的 after；Tk 卡住时超时返回 None
+
+        Tk 卡住期间只保留一个未完成的请求，后续转储复用它，不会每次多挂一个线程。
+        """
+        with self._after_fetch_lock:
+            fetch = self._after_fetch
+            if fetch is None or fetch[1].is_set():
+                fetch = self._after_fetch = ([], threading.Event())
+                box, done = fetch
+
+                def collect():
+                    box.append(self._pending_after())
+                    done.set()
+
+                def post():
+                    # 跨线程调用 Tk 会等待主循环处理，放在单独线程里以免卡住转储
+                    try:
+                        self.root.after(0, collect)
+                    except Exception:  # 主循环未运行：直接结束本次请求，下次转储重试
+                        box.append(None)
+                        done.set()
+
+                threading.Thread(target=post, name="diag-tk", daemon=True).start()
+        box, done = fetch
+        return box[0] if done.wait(DUMP_TK_TIMEOUT_S) else None
+
+    def _install_dump_signal(self):
+        """POSIX：SIGUSR1 触发转储
+
+        Python 层的信号处理函数要等主线程回到字节码才执行，而主线程可能长时间阻塞在 Tk 主循环里；
+        因此用 set_wakeup_fd 让 C 层处理函数直接写管道，由独立线程读取后转储。
+        """
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        r, w = os.pipe()
+        os.set_blocking(w, False)
+        signal.signal(signal.SIGUSR1, lambda *_: None)  # 只为屏蔽默认的终止行为
+        signal.set_wakeup_fd(w)
+
+        def watch():
+            while True:
+                for signum in os.read(r, 64):
+                    if signum == signal.SIGUSR1:
+                        self.dump_diagnostics()
+
+        threading.Thread(target=watch, name="diag-signal", daemon=True).start()
+
+    def dump_diagnostics(self):
+        """在独立线程中立即写出诊断文件，不依赖 Tk 主循环是否响应；可在任意线程调用"""
+        threading.Thread(target=self._write_dump, name="diag-dump", daemon=True).start()
+
+    def _write_dump(self):
+        try:
+            path = write_diagnostic_dump(self, self._pending_after_with_timeout)
+        except Exception as e:
+            print("[诊断] 写转储失败:", e)
+            return
+        print("[诊断] 已写入", path)
+        self._notify(self.t("notif_dump_title"), str(path))
+
+    def pending_seconds(self):
+        """当前段尚未冲账的 (work/rest, 秒)；不在计时中返回 (None, 0)"""
+        if self.state in ("working", "paused_work"):
+            kind = "work"
+        elif self.state in ("resting", "paused_rest"):
+            kind = "rest"
+        else:
+            return None, 0
+        return kind, max(0, self.elapsed_seconds - self.session_flushed)
+
+    def _record_session(self):
+        """把刚结束的一段记入最近记录（仅内存）"""
+        kind, _ = self.pending_seconds()
+        if kind and self.elapsed_seconds > 0:
+            self.sessions.append((kind, self.segment_started, self.elapsed_seconds, self.tag))
+
     # === 静音通知 ===
     def _notify(self, title, msg):
+        """非阻塞：排队后立即返回，可在调度线程 / 托盘线程 / Tk 线程调用"""
+        self._notify_queue.put((title, msg))
+
+    def _notify_worker(self):
+        while True:
+            title, msg = self._notify_queue.get()
+            try:
+                self._send_notification(title, msg)
+            except Exception as e:
+                print("[通知] 发送失败:", e)
+
+    def _send_notification(self, title, msg):
         if use_win11_toast and platform.system() == "Windows":
             try:
                 toast(title, msg, audio={"silent": "true"}, duration="short")
@@ -450,50 +1225,51 @@ class WorkRestApp:
         else:
             print(f"[通知] {title}: {msg}")
 
-    # === 主计时线程 ===
-    # ---------- 主计时线程 ----------
-    def _timer_loop(self):
-        while self.running.is_set():
-
-            # ------ 工作 ------
-            self.session_flushed = 0
-            self.state = "working"
-            self.elapsed_seconds = 0
-            self._notify(self.t("notif_work_begin_title"), self.t("notif_work_begin_msg", duration=fmt_sec(self.work_sec)))
-
-            # 修改：支持 paused_work 状态，暂停时 stay in work loop
-            while (
-                self.running.is_set()
-                and self.state in ("working", "paused_work")
-                and self.elapsed_seconds < self.work_sec
-            ):
-                if self.paused.is_set():
-                    time.sleep(0.5)
-                    continue
-                time.sleep(1)
-                self.elapsed_seconds += 1
+    # === 主计时（调度器每秒回调） ===
+    def _begin_work(self):
+        self.config_watcher.check()
+        self.session_flushed = 0
+        self.state = "working"
+        self.elapsed_seconds = 0
+        self.segment_started = time.time()
+        self._notify(self.t("notif_work_begin_title"), self.t("notif_work_begin_msg", duration=fmt_sec(self.work_sec)))
+
+    def _begin_rest(self):
+        self.config_watcher.check()
+        self._record_session()
+        self.session_flushed = 0
+        self.state = "resting"
+        self.elapsed_seconds = 0
+        self.segment_started = time.time()
+        self._notify(self.t("notif_rest_begin_title"), self.t("notif_rest_begin_msg", duration=fmt_sec(self.rest_sec)))
+        self.root.after(0, self._show_rest_window, time.perf_counter())
+
+    def _on_tick(self, _timer):
+        if not self.paused.is_set():
+            self.elapsed_seconds += 1
+        # 暂停中缩短工作时长（见设置窗口）会清除暂停并恢复计时，下一拍即结束工作段
+        if self.state in ("working", "paused_work") and self.elapsed_seconds >= self.work_sec:
             self._flush_elapsed()
-
-            # 退出后不再启动休息段
-            if not self.running.is_set():
-                break
-
-            # ------ 休息 ------
-            self.session_flushed = 0
-            self.state = "resting"
-            self.elapsed_seconds = 0
-            self._notify(self.t("notif_rest_begin_title"), self.t("notif_rest_begin_msg", duration=fmt_sec(self.rest_sec)))
-            self.root.after(0, self._show_rest_window)
-
-            while (
-                self.running.is_set()
-                and self.state in ("resting", "paused_rest")
-            ):
-                while self.paused.is_set():
-                    time.sleep(0.5)
-                time.sleep(1)
-                self.elapsed_seconds += 1
-            # 休息段的计入仍由 end_rest() 负责
+            self._begin_rest()
+        # 休息段的计入仍由 end_rest() 负责
+
+    # === 附加倒计时 ===
+    def start_countdown(self, minutes, tag=COUNTDOWN_TAG):
+        name = f"{COUNTDOWN_PREFIX}{next(self._countdown_ids)}"
+        self.scheduler.add(name, minutes * 60, self._on_countdown_done, tag=tag)
+        return name
+
+    def cancel_countdowns(self):
+        for name, _, _ in self.scheduler.active():
+            if name.startswith(COUNTDOWN_PREFIX):
+                self.scheduler.cancel(name)
+
+    def _on_countdown_done(self, timer):
+        add_tag_seconds(self.stats, timer.tag, "timer", timer.seconds)
+        self._notify(
+            self.t("notif_countdown_title"),
+            self.t("notif_countdown_msg", tag=timer.tag, duration=fmt_sec(timer.seconds)),
+        )
 
     # === 托盘图标 ===
     @staticmethod
@@ -524,7 +1300,19 @@ class WorkRestApp:
             pause_item,
             pystray.MenuItem(self.t("current_status"), self._menu_status),
             pystray.MenuItem(self.t("view_stats"), self._menu_stats),
+            pystray.MenuItem(self.t("dashboard"), self._menu_dashboard),
             pystray.MenuItem(self.t("open_settings"), self._menu_settings),
+            pystray.MenuItem(
+                self.t("countdown"),
+                pystray.Menu(
+                    *(
+                        pystray.MenuItem(self.t("countdown_min", minutes=m), self._countdown_action(m))
+                        for m in COUNTDOWN_PRESETS_MIN
+                    ),
+                    pystray.MenuItem(self.t("countdown_cancel"), self._menu_cancel_countdowns),
+                ),
+            ),
+            pystray.MenuItem(self.t("diag_dump"), self._menu_dump, visible=self.debug),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem(self.t("exit"), self._quit),
         )
@@ -540,49 +1328,52 @@ class WorkRestApp:
             return
         self.running.set()
         self.paused.clear()
-        self.timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
-        self.timer_thread.start()
+        self._begin_work()
+        self.scheduler.add(POMODORO_TIMER, 1, self._on_tick, tag=self.tag, interval=1)
 
     def pause_resume(self):
         if self.state not in ("working", "resting", "paused_work", "paused_rest"):
             return
         if self.paused.is_set():  # 继续
             self.paused.clear()
+            self.scheduler.resume(POMODORO_TIMER)
             self.state = "working" if self.state == "paused_work" else "resting"
             self._notify(self.t("notif_continue_title"), self.t("notif_continue_msg"))
         else:  # 暂停
             self.paused.set()
+            self.scheduler.pause(POMODORO_TIMER)  # 暂停期间调度线程不再被唤醒
+            self._flush_elapsed()  # 先记账，保证按小时拆分时不把暂停时间算进去
             self.state = "paused_work" if self.state == "working" else "paused_rest"
             self._notify(self.t("notif_paused_title"), self.t("notif_paused_msg"))
 
     def end_rest(self):
         self._flush_elapsed()  # 用冲账替代整段累加
-        self.state = "working"
+        self._record_session()
+        if self.running.is_set():
+            self._begin_work()
 
     def stop(self):
+        self.scheduler.cancel(POMODORO_TIMER)
         self.running.clear()
         self.paused.clear()
         self.state = "idle"
 
     # === 子窗 ===
-    def _show_rest_window(self):
-        if self.rest_win and self.rest_win.winfo_exists():
-            self.rest_win.destroy()
-        self.rest_win = RestWindow(self)
+    def _show_rest_window(self, began_at=None):
+        self.windows.show(RestWindow, began_at)
 
     # === 设置窗口 ===
     def open_settings(self):
         self._flush_elapsed()  # 确保数据显示最新
-        if not self.settings_win or not self.settings_win.winfo_exists():
-            self.settings_win = SettingsWindow(self)
-        self.settings_win.deiconify()
-        self.settings_win.lift()
+        self.config_watcher.check()
+        self.windows.show(SettingsWindow)
 
     # === 托盘回调 ===
     def _menu_pause(self, *_):
         self.pause_resume()
 
     def _menu_status(self, *_):
+        self.config_watcher.check()
         paused = self.paused.is_set()
         if self.state in ("working", "paused_work"):
             progress = self.t(
@@ -602,11 +1393,18 @@ class WorkRestApp:
             self._notify(self.t("current_status"), f"{progress} ({state_label})")
         else:
             self._notify(self.t("current_status"), self.t("timer_not_started"))
+        side = [
+            self.t("status_side_timer", tag=tag or name, remaining=fmt_sec(int(left)))
+            for name, tag, left in self.scheduler.active()
+            if name != POMODORO_TIMER
+        ]
+        if side:
+            self._notify(self.t("countdown"), "\n".join(side))
 
     def _menu_stats(self, *_):
         self._flush_elapsed()
         s, today = self.stats, str(date.today())
-        d = s["days"].get(today, {"work": 0, "rest": 0})
+        d = day_totals(s, today)
         # 使用多语言字符串构建统计信息
         today_label = self.t("stats_today")
         total_label = self.t("stats_total")
@@ -617,16 +1415,28 @@ class WorkRestApp:
             f"{today_label} {work_label} {fmt_sec(d['work'])}  {rest_label} {fmt_sec(d['rest'])}\n"
             f"{total_label} {work_label} {fmt_sec(s['total_work'])}  {rest_label} {fmt_sec(s['total_rest'])}",
         )
-        save_stats(self.stats)  # 已是最新
+        # _flush_elapsed 有增量时已写盘，这里不再在托盘线程上同步保存
+
+    def _menu_dashboard(self, *_):
+        # 只读内存数据，不冲账也不写盘；窗口操作交给 Tk 线程
+        self.root.after(0, self.windows.show, DashboardWindow)
 
     def _menu_settings(self, *_):
         self.open_settings()
 
+    def _countdown_action(self, minutes):
+        return lambda *_: self.start_countdown(minutes)
+
+    def _menu_cancel_countdowns(self, *_):
+        self.cancel_countdowns()
+
+    def _menu_dump(self, *_):
+        self.dump_diagnostics()
+
     # === 彻底退出 ===
     def _quit(self, *_):
         self.stop()
-        if self.timer_thread:
-            self.timer_thread.join(timeout=1)
+        self.scheduler.stop()
         if self.icon:
             try:
                 self.icon.visible = False
@@ -648,7 +1458,7 @@ class WorkRestApp:
 
     # === 入口 ===
     def run(self):
-        self.tray_thread = threading.Thread(target=self._run_tray, daemon=True)
+        self.tray_thread = threading.Thread(target=self._run_tray, name="tray", daemon=True)
         self.tray_thread.start()
         self.root.mainloop()
 
@@ -663,12 +1473,10 @@ class WorkRestApp:
         # Rebuild tray menu if icon exists
         if self.icon:
             self._rebuild_tray_menu()
-        # Update rest window
-        if self.rest_win and self.rest_win.winfo_exists():
-            self.rest_win.update_language()
-        # Update start window
-        if getattr(self, "start_win", None) and self.start_win.winfo_exists():
-            self.start_win.update_language()
+        # Update every pooled window (start / rest / settings)
+        for win in self.windows.existing():
+            if hasattr(win, "update_language"):
+                win.update_language()
 
 
 # ---------- 设置窗口 ----------
@@ -686,10 +1494,10 @@ class SettingsWindow(tk.Toplevel):
         self.configure(bg=DARK_BG)
         self.resizable(False, False)
         self.attributes("-topmost", True)  # 置顶
-        apply_dark_style(self)
 
         self.work_min = tk.IntVar(value=app.work_sec // 60)
         self.rest_min = tk.IntVar(value=app.rest_sec // 60)
+        self.tag_var = tk.StringVar(value=app.tag)
 
         # --- validation function for positive integers ---
         vcmd = (self.register(self._validate_positive_int), "%P")
@@ -708,6 +1516,9 @@ class SettingsWindow(tk.Toplevel):
         ttk.Entry(self, textvariable=self.rest_min, width=10, validate="key", validatecommand=vcmd).grid(
             row=1, column=1, pady=8, padx=8
         )
+        self.lbl_tag = ttk.Label(self, text=app.t("tag_label"))
+        self.lbl_tag.grid(row=2, column=0, pady=8, padx=8, sticky="w")
+        ttk.Entry(self, textvariable=self.tag_var, width=14).grid(row=2, column=1, pady=8, padx=8)
 
         # --- Language selection ---
         self.lbl_lang = ttk.Label(self, text=app.t("language_label"))
@@ -725,65 +1536,50 @@ class SettingsWindow(tk.Toplevel):
 
         self.protocol("WM_DELETE_WINDOW", self.withdraw)
 
-    def save_close(self):
-        self.app.work_sec = max(60, self.work_min.get() * 60)
-        self.app.rest_sec = max(60, self.rest_min.get() * 60)
-        self.app.stats["config"]["work_sec"] = self.app.work_sec
-        self.app.stats["config"]["rest_sec"] = self.app.rest_sec
-        save_stats(self.app.stats)
-        # ✨ 如果正在休息，就立即刷新窗口显示
-        if self.app.rest_win and self.app.rest_win.winfo_exists():
-            self.app.rest_win.refresh_info()
-        if (
-            self.app.state in ("working", "paused_work")
-            and self.app.elapsed_seconds >= self.app.work_sec
-        ):
-            # 让工作段立即结束
-            self.app.paused.clear()
-        self.withdraw()
+    def show(self):
+        """复用窗口：把输入框同步为当前配置后再显示"""
+        self.sync_fields(DEF_CONFIG)
+        self.deiconify()
+        self.lift()
+
+    def sync_fields(self, keys):
+        """把 keys 中涉及的输入框改为当前配置值"""
+        if "work_sec" in keys:
+            self.work_min.set(self.app.work_sec // 60)
+        if "rest_sec" in keys:
+            self.rest_min.set(self.app.rest_sec // 60)
+        if "tag" in keys:
+            self.tag_var.set(self.app.tag)
+        if "lang" in keys:
+            self.lang_var.set(self.app.t("lang_zh") if self.app.lang == "zh" else self.app.t("lang_en"))
 
-        # --- language ---
+    def save_close(self):
+        # 只提交用户改动过的项：外部写入的非整分钟时长不会被取整覆盖
+        changes = {"tag": self.tag_var.get().strip()}
+        if self.work_min.get() != self.app.work_sec // 60:
+            changes["work_sec"] = max(MIN_SEGMENT_S, self.work_min.get() * 60)
+        if self.rest_min.get() != self.app.rest_sec // 60:
+            changes["rest_sec"] = max(MIN_SEGMENT_S, self.rest_min.get() * 60)
         sel = self.lang_var.get()
-        new_lang = "en" if sel.lower().startswith("e") else "zh"
-        if new_lang == self.app.lang:
-            return
-        self.app.lang = new_lang
-        self.app.stats["config"]["lang"] = new_lang
-        save_stats(self.app.stats)
-
-        # Update texts of widgets in this window
-        self.title(self.app.t("settings_title"))
-        self.lbl_work.config(text=self.app.t("work_min_label"))
-        self.lbl_rest.config(text=self.app.t("rest_min_label"))
-        self.lbl_lang.config(text=self.app.t("language_label"))
-        self.save_btn.config(text=self.app.t("save_close_btn"))
-        # Update combobox values labels
-        self.cmb_lang.config(values=[self.app.t("lang_zh"), self.app.t("lang_en")])
-
-        # Notify app to rebuild other UI parts
-        self.app.apply_language_change()
+        changes["lang"] = "en" if sel.lower().startswith("e") else "zh"
+        self.app.apply_config(changes)
+        self.withdraw()
 
     def _on_lang_change(self, *_):
         sel = self.lang_var.get()
-        new_lang = "en" if sel.lower().startswith("e") else "zh"
-        if new_lang == self.app.lang:
-            return
-        self.app.lang = new_lang
-        self.app.stats["config"]["lang"] = new_lang
-        save_stats(self.app.stats)
+        self.app.apply_config({"lang": "en" if sel.lower().startswith("e") else "zh"})
 
-        # Update texts of widgets in this window
+    def update_language(self):
+        """Refresh texts of widgets in this window (called via app.apply_language_change)."""
         self.title(self.app.t("settings_title"))
         self.lbl_work.config(text=self.app.t("work_min_label"))
         self.lbl_rest.config(text=self.app.t("rest_min_label"))
+        self.lbl_tag.config(text=self.app.t("tag_label"))
         self.lbl_lang.config(text=self.app.t("language_label"))
         self.save_btn.config(text=self.app.t("save_close_btn"))
         # Update combobox values labels
         self.cmb_lang.config(values=[self.app.t("lang_zh"), self.app.t("lang_en")])
 
-        # Notify app to rebuild other UI parts
-        self.app.apply_language_change()
-
     # --- validation helper ---
     @staticmethod
     def _validate_positive_int(p: str) -> bool:
@@ -793,6 +1589,152 @@ class SettingsWindow(tk.Toplevel):
         return p.isdigit() and int(p) > 0
 
 
+# ---------- 统计面板 ----------
+class DashboardWindow(tk.Toplevel):
+    """今日 / 本周 / 累计统计 + 当前段进度 + 最近记录
+
+    只读内存：已冲账部分取自 app.stats，未冲账部分取 app.pending_seconds()，
+    打开或刷新都不会冲账、读文件或写盘。窗口隐藏时停止刷新。
+    """
+
+    def __init__(self, app):
+        super().__init__(app.root)
+        self.iconphoto(True, app.tk_icon)
+        self.app = app
+        self.title(app.t("dashboard"))
+        self.configure(bg=DARK_BG)
+        self.resizable(False, False)
+
+        self._tick_id = None
+        self._texts = {}  # 上次写入的文本，未变化时不触发重绘
+        self._base_key = None  # (今天, 累计工作, 累计休息)：变化时才重算本周基数
+        self._week_base = {"work": 0, "rest": 0}
+
+        self.lbl_work = ttk.Label(self)
+        self.lbl_work.grid(row=0, column=1, padx=12, pady=(16, 4))
+        self.lbl_rest = ttk.Label(self)
+        self.lbl_rest.grid(row=0, column=2, padx=12, pady=(16, 4))
+
+        self.row_labels, self.vars = {}, {}
+        for r, key in enumerate(("stats_today", "stats_week", "stats_total"), start=1):
+            self.row_labels[key] = ttk.Label(self)
+            self.row_labels[key].grid(row=r, column=0, padx=(16, 8), pady=2, sticky="w")
+            for c, kind in enumerate(("work", "rest"), start=1):
+                var = self.vars[(key, kind)] = tk.StringVar()
+                ttk.Label(self, textvariable=var).grid(row=r, column=c, padx=12, pady=2)
+
+        self.var_progress = tk.StringVar()
+        ttk.Label(self, textvariable=self.var_progress).grid(
+            row=4, column=0, columnspan=3, padx=16, pady=(14, 4), sticky="w"
+        )
+        self.progress = ttk.Progressbar(self, length=260, maximum=1.0)
+        self.progress.grid(row=5, column=0, columnspan=3, padx=16, pady=(0, 10))
+
+        self.lbl_recent = ttk.Label(self)
+        self.lbl_recent.grid(row=6, column=0, columnspan=3, padx=16, sticky="w")
+        self.var_recent = tk.StringVar()
+        ttk.Label(self, textvariable=self.var_recent, justify="left").grid(
+            row=7, column=0, columnspan=3, padx=16, pady=(2, 16), sticky="w"
+        )
+
+        self.update_language()
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+    def show(self):
+        self._base_key = None
+        self.deiconify()
+        self.lift()
+        if self._tick_id is not None:
+            self.after_cancel(self._tick_id)
+        self._tick()
+
+    def _tick(self):
+        self._tick_id = None
+        st = self.state()
+        if st == "withdrawn":
+            return  # 隐藏后不再调度，show() 时重新开始
+        if st == "normal":
+            self.refresh()
+        self._tick_id = self.after(DASHBOARD_REFRESH_MS, self._tick)
+
+    def _set(self, var, text):
+        name = str(var)  # Variable 不可哈希，用 Tcl 变量名作键
+        if self._texts.get(name) != text:
+            self._texts[name] = text
+            var.set(text)
+
+    def _rebase(self, today: str):
+        """本周（周一起）今天之前的已冲账秒数；只在有冲账或跨天后重算"""
+        stats = self.app.stats
+        key = (today, stats["total_work"], stats["total_rest"])
+        if key == self._base_key:
+            return
+        self._base_key = key
+        d = date.fromisoformat(today)
+        base = {"work": 0, "rest": 0}
+        for i in range(1, d.weekday() + 1):
+            t = day_totals(stats, str(d - timedelta(days=i)))
+            base["work"] += t["work"]
+            base["rest"] += t["rest"]
+        self._week_base = base
+
+    def refresh(self):
+        app, stats = self.app, self.app.stats
+        today = str(date.today())
+        self._rebase(today)
+        kind, pending = app.pending_seconds()
+
+        day = day_totals(stats, today)
+        rows = {
+            "stats_today": day,
+            "stats_week": {k: self._week_base[k] + day[k] for k in ("work", "rest")},
+            "stats_total": {"work": stats["total_work"], "rest": stats["total_rest"]},
+        }
+        for key, vals in rows.items():
+            for k in ("work", "rest"):
+                self._set(self.vars[(key, k)], fmt_sec(vals[k] + (pending if k == kind else 0)))
+
+        if kind is None:
+            self._set(self.var_progress, app.t("timer_not_started"))
+            frac = 0.0
+        else:
+            target = app.work_sec if kind == "work" else app.rest_sec
+            text = app.t(
+                "status_work_progress" if kind == "work" else "status_rest_progress",
+                elapsed=fmt_sec(app.elapsed_seconds),
+                target=fmt_sec(target),
+            )
+            if app.paused.is_set():
+                text += f" ({app.t('status_paused_label')})"
+            self._set(self.var_progress, text)
+            frac = min(1.0, app.elapsed_seconds / target) if target else 0.0
+        if self._texts.get("progress") != frac:
+            self._texts["progress"] = frac
+            self.progress["value"] = frac
+
+        lines = [
+            f"{datetime.fromtimestamp(started):%m-%d %H:%M}  "
+            f"{app.t('stats_work' if k == 'work' else 'stats_rest')} {fmt_sec(sec)}"
+            + (f"  [{tag}]" if tag else "")
+            # 先拷贝：调度线程可能同时 append，直接迭代 deque 会抛 RuntimeError
+            for k, started, sec, tag in reversed(list(app.sessions))
+            if started is not None
+        ]
+        self._set(self.var_recent, "\n".join(lines) or app.t("no_sessions"))
+
+    def update_language(self):
+        """Refresh static texts; dynamic ones are redrawn on the next refresh."""
+        self.title(self.app.t("dashboard"))
+        self.lbl_work.config(text=self.app.t("stats_work"))
+        self.lbl_rest.config(text=self.app.t("stats_rest"))
+        for key, lbl in self.row_labels.items():
+            lbl.config(text=self.app.t(key))
+        self.lbl_recent.config(text=self.app.t("recent_sessions"))
+        self._texts.clear()
+        if self.state() == "normal":
+            self.refresh()
+
+
 # -------- main --------
 if __name__ == "__main__":
     WorkRestApp().run()